@@ -0,0 +1,41 @@
+"""
+Bake the project's .env into src/utils/config_cache.py.
+
+The generated module holds the parsed values as a dict literal, so at
+startup config.py imports it (from the bytecode cache) instead of parsing
+.env:
+
+    python scripts/compile_env.py
+
+config.py only uses the cache while .env exists and is not newer than
+it, so later edits to .env are picked up without recompiling. The cache
+is kept out of the Docker build context.
+"""
+
+import sys
+from pathlib import Path
+from pprint import pformat
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.utils.config import ENV_FILE, parse_env_file  # noqa: E402
+
+OUTPUT = ROOT / "src" / "utils" / "config_cache.py"
+
+
+def compile_env() -> dict:
+    if not ENV_FILE.exists():
+        sys.exit(f"No .env file at {ENV_FILE}")
+    values = parse_env_file(ENV_FILE)
+
+    OUTPUT.write_text(
+        '"""Generated by scripts/compile_env.py from .env; do not edit."""\n\n'
+        f"DOTENV = {pformat(values)}\n"
+    )
+    return values
+
+
+if __name__ == "__main__":
+    values = compile_env()
+    print(f"Wrote {len(values)} values from {ENV_FILE} to {OUTPUT}")
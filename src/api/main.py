@@ -11,12 +11,14 @@ import sys
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
+import numpy as np
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
+from ..models.batcher import DynamicBatcher
 from ..models.sentence_transformers import model_manager
-from ..utils.config import settings
+from ..utils.config import MAX_BATCH_SIZE, settings
 from .schemas import (
     TextInput,
     BatchTextInput,
@@ -37,6 +39,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Coalesces concurrent inference requests into batched encodes that run on a
+# dedicated worker thread, keeping the event loop free for request I/O.
+# Requests are grouped by text length so batches carry little padding, and
+# each batch is tokenized on a second thread while the previous one encodes
+batcher = DynamicBatcher(
+    model_manager.embed,
+    max_batch_size=MAX_BATCH_SIZE,
+    batch_wait_timeout_s=settings.BATCH_WAIT_TIMEOUT_MS / 1000,
+    tokenize_fn=model_manager.tokenize,
+)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -58,10 +71,16 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to load model during startup: {str(e)}")
         # continue anyway - the model can be loaded on first request
 
+    batcher.start()
+
+    # Build the OpenAPI schema now rather than on the first /docs request
+    app.openapi()
+
     yield  # Application runs
 
     # Shutdown
     logger.info("Shutting down application...")
+    await batcher.stop()
 
 
 # FastAPI application
@@ -70,6 +89,7 @@ app = FastAPI(
     version=settings.APP_VERSION,
     description="Production-ready ML inference service for text embeddings",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware for browser-based clients
@@ -90,10 +110,10 @@ async def add_process_time_header(request: Request, call_next):
 
     Helpful for performance monitoring and debugging.
     """
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(round(process_time * 1000, 2))
+    process_time_ms = (time.perf_counter_ns() - start_time) / 1e6
+    response.headers["X-Process-Time"] = f"{process_time_ms:.2f}"
     return response
 
 
@@ -101,7 +121,7 @@ async def add_process_time_header(request: Request, call_next):
 @app.exception_handler(ValueError)
 async def value_error_handler(request: Request, exc: ValueError):
     """Handle validation errors with proper error responses."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
         content={"error": "Invalid input", "detail": str(exc)},
     )
@@ -180,8 +200,20 @@ async def predict(input_data: TextInput):
     a dense vector representation.
     """
     try:
-        result = model_manager.predict_single(input_data.text)
-        return EmbeddingResponse(**result)
+        start_time = time.perf_counter_ns()
+        embedding = await batcher.submit(input_data.text)
+        inference_time_ms = (time.perf_counter_ns() - start_time) / 1e6
+
+        # Returned as a response directly so the ndarray skips Pydantic and
+        # jsonable_encoder; orjson serializes the buffer in C
+        return ORJSONResponse(
+            {
+                "embedding": embedding,
+                "dimension": len(embedding),
+                "model_version": model_manager.model_name,
+                "inference_time_ms": round(inference_time_ms, 2),
+            }
+        )
     except Exception as e:
         logger.error(f"Prediction failed: {str(e)}")
         raise HTTPException(
@@ -202,8 +234,23 @@ async def predict_batch(input_data: BatchTextInput):
     Generate embeddings for multiple texts efficiently.
     """
     try:
-        result = model_manager.predict_batch(input_data.texts)
-        return BatchEmbeddingResponse(**result)
+        # Batch size is already bounded by BatchTextInput validation
+        batch_size = len(input_data.texts)
+
+        start_time = time.perf_counter_ns()
+        embeddings = await batcher.submit_many(input_data.texts)
+        inference_time_ms = (time.perf_counter_ns() - start_time) / 1e6
+
+        return ORJSONResponse(
+            {
+                "embeddings": embeddings,
+                "batch_size": batch_size,
+                "dimension": embeddings.shape[1],
+                "model_version": model_manager.model_name,
+                "inference_time_ms": round(inference_time_ms, 2),
+                "avg_time_per_item_ms": round(inference_time_ms / batch_size, 2),
+            }
+        )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
@@ -229,8 +276,20 @@ async def compute_similarity(input_data: SimilarityInput):
     0 means unrelated, and -1 means opposite meaning.
     """
     try:
-        result = model_manager.compute_similarity(input_data.text1, input_data.text2)
-        return SimilarityResponse(**result)
+        start_time = time.perf_counter_ns()
+        embeddings = await batcher.submit_many(
+            [input_data.text1, input_data.text2], normalize=True
+        )
+        # Unit-norm rows: cosine similarity is a single dot product.
+        # Clamp float rounding so identical texts don't exceed 1.0
+        similarity = float(np.clip(embeddings[0] @ embeddings[1], -1.0, 1.0))
+        inference_time_ms = (time.perf_counter_ns() - start_time) / 1e6
+
+        return SimilarityResponse(
+            similarity=similarity,
+            model_version=model_manager.model_name,
+            inference_time_ms=round(inference_time_ms, 2),
+        )
     except Exception as e:
         logger.error(f"Similarity computation failed: {str(e)}")
         raise HTTPException(
@@ -262,12 +321,13 @@ async def root():
 
 
 # OpenAPI customization
-@app.get("/openapi.json", include_in_schema=False)
-async def custom_openapi():
+def custom_openapi() -> Dict[str, Any]:
     """
     Customize OpenAPI schema.
 
     Adds extra metadata to improve the auto-generated documentation.
+    Installed as app.openapi, so FastAPI's own /openapi.json route and
+    /docs serve it; the result is cached on app.openapi_schema.
     """
     if app.openapi_schema:
         return app.openapi_schema
@@ -293,8 +353,14 @@ async def custom_openapi():
     return app.openapi_schema
 
 
+app.openapi = custom_openapi  # type: ignore[method-assign]
+
+
 if __name__ == "__main__":
-    # This allows running the module directly for development
+    # This allows running the module directly for development.
+    # For multiple workers use the uvicorn CLI with --workers $API_WORKERS
+    # (as the Dockerfile does): spawned workers re-import __main__, and this
+    # module is too slow to import for uvicorn's worker health check.
     import uvicorn
 
     uvicorn.run(
@@ -3,8 +3,14 @@ Pydantic models for API request and response validation.
 
 """
 
-from typing import List, Optional
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from typing import Annotated, List, Optional
+from pydantic import BaseModel, Field, ConfigDict, StringConstraints
+
+from ..utils.config import MAX_BATCH_SIZE
+
+# Input texts are stripped before the length check, so whitespace-only
+# input fails min_length. Both run in pydantic-core, not Python validators.
+InputText = Annotated[str, StringConstraints(min_length=1, max_length=512)]
 
 
 class TextInput(BaseModel):
@@ -12,29 +18,18 @@ class TextInput(BaseModel):
 
     # Pydantic v2 uses model_config instead of nested Config class
     model_config = ConfigDict(
-        json_schema_extra={"example": {"text": "This is a sentence to be embedded."}}
-    )
-
-    text: str = Field(
-        ...,
-        min_length=1,
-        max_length=512,
-        description="Input text to generate embedding for",
+        str_strip_whitespace=True,
+        json_schema_extra={"example": {"text": "This is a sentence to be embedded."}},
     )
 
-    @field_validator("text")
-    @classmethod
-    def validate_text(cls, v: str) -> str:
-        """Ensure text is not just whitespace."""
-        if not v.strip():
-            raise ValueError("Text cannot be empty or only whitespace")
-        return v.strip()
+    text: InputText = Field(..., description="Input text to generate embedding for")
 
 
 class BatchTextInput(BaseModel):
     """Multiple texts for batch processing."""
 
     model_config = ConfigDict(
+        str_strip_whitespace=True,
         json_schema_extra={
             "example": {
                 "texts": [
@@ -43,56 +38,32 @@ class BatchTextInput(BaseModel):
                     "Sentence 3 to be embedded",
                 ]
             }
-        }
+        },
     )
 
-    texts: List[str] = Field(
+    texts: List[InputText] = Field(
         ...,
         min_length=1,
-        max_length=32,
+        max_length=MAX_BATCH_SIZE,
         description="List of texts to process",
     )
 
-    @field_validator("texts")
-    @classmethod
-    def validate_texts(cls, v: List[str]) -> List[str]:
-        """Validate each text in the batch."""
-        cleaned = []
-        for text in v:
-            if not text.strip():
-                raise ValueError("Texts cannot be empty or only whitespace")
-            if len(text) > 512:
-                raise ValueError(f"Text exceeds maximum length of 512 characters")
-            cleaned.append(text.strip())
-        return cleaned
-
 
 class SimilarityInput(BaseModel):
     """Input for computing similarity between two texts."""
 
     model_config = ConfigDict(
+        str_strip_whitespace=True,
         json_schema_extra={
             "example": {
                 "text1": "Sentence one for batch inference",
                 "text2": "Sentence two for batch inference",
             }
-        }
-    )
-
-    text1: str = Field(
-        ..., min_length=1, max_length=512, description="First text for comparison"
-    )
-    text2: str = Field(
-        ..., min_length=1, max_length=512, description="Second text for comparison"
+        },
     )
 
-    @field_validator("text1", "text2")
-    @classmethod
-    def validate_text(cls, v: str) -> str:
-        """Ensure texts are not just whitespace."""
-        if not v.strip():
-            raise ValueError("Text cannot be empty or only whitespace")
-        return v.strip()
+    text1: InputText = Field(..., description="First text for comparison")
+    text2: InputText = Field(..., description="Second text for comparison")
 
 
 class EmbeddingResponse(BaseModel):
@@ -2,7 +2,7 @@
 
 import polars as pl
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
 
 class BookDataLoader:
@@ -10,51 +10,83 @@ class BookDataLoader:
     
     def __init__(self, data_dir: str = "data/raw"):
         self.data_dir = Path(data_dir)
+        self._frames: Optional[Tuple[pl.DataFrame, pl.DataFrame, pl.DataFrame]] = None
         
-    def load_books(self) -> pl.DataFrame:
-        """Load books dataset."""
-        books = pl.read_csv(self.data_dir / "Books.csv", 
-                           encoding='latin-1',
+    def load_books(self) -> pl.LazyFrame:
+        """Scan books dataset lazily."""
+        books = pl.scan_csv(self.data_dir / "Books.csv", 
+                           encoding='utf8-lossy',
                            truncate_ragged_lines=True,
                            schema_overrides={"Year-Of-Publication": pl.Utf8})
         return books
     
-    def load_ratings(self) -> pl.DataFrame:
-        """Load ratings dataset."""
-        ratings = pl.read_csv(self.data_dir / "Ratings.csv", 
-                             encoding='latin-1')
+    def load_ratings(self) -> pl.LazyFrame:
+        """Scan ratings dataset lazily."""
+        ratings = pl.scan_csv(self.data_dir / "Ratings.csv", 
+                             encoding='utf8-lossy')
         return ratings
     
-    def load_users(self) -> pl.DataFrame:
-        """Load users dataset."""
-        users = pl.read_csv(self.data_dir / "Users.csv", 
-                           encoding='latin-1')
+    def load_users(self) -> pl.LazyFrame:
+        """Scan users dataset lazily."""
+        users = pl.scan_csv(self.data_dir / "Users.csv", 
+                           encoding='utf8-lossy')
         return users
     
-    def load_all(self) -> Tuple[pl.DataFrame, pl.DataFrame, pl.DataFrame]:
-        """Load all datasets."""
+    def load_all(self) -> Tuple[pl.LazyFrame, pl.LazyFrame, pl.LazyFrame]:
+        """Scan all datasets lazily; nothing is read until collected."""
         return self.load_books(), self.load_ratings(), self.load_users()
     
+    def collect_all(self) -> Tuple[pl.DataFrame, pl.DataFrame, pl.DataFrame]:
+        """Read all datasets in parallel; the result is cached on the loader."""
+        frames = self._frames
+        if frames is None:
+            books, ratings, users = pl.collect_all(self.load_all())
+            frames = self._frames = (books, ratings, users)
+        return frames
+    
     def validate_data(self) -> dict:
-        """Validate loaded data and return basic stats."""
-        books, ratings, users = self.load_all()
+        """
+        Validate loaded data and return basic stats.
+        
+        Only the aggregates are computed, in one parallel pass over the
+        three files, so the full frames are never materialized. If the
+        data was already read with collect_all, the cached frames are used
+        instead of scanning the CSVs again.
+        """
+        if self._frames is not None:
+            books, ratings, users = (frame.lazy() for frame in self._frames)
+        else:
+            books, ratings, users = self.load_all()
+        
+        book_stats, rating_stats, user_stats = pl.collect_all([
+            books.select(
+                pl.len().alias('count'),
+                pl.col('ISBN').n_unique().alias('unique_isbns'),
+                pl.col('Book-Title').null_count().alias('missing_titles')
+            ),
+            ratings.select(
+                pl.len().alias('count'),
+                pl.col('User-ID').n_unique().alias('unique_users'),
+                pl.col('ISBN').n_unique().alias('unique_books'),
+                pl.col('Book-Rating').min().alias('min_rating'),
+                pl.col('Book-Rating').max().alias('max_rating')
+            ),
+            users.select(
+                pl.len().alias('count'),
+                pl.col('User-ID').n_unique().alias('unique_users')
+            )
+        ])
+        rating_row = rating_stats.row(0, named=True)
         
         stats = {
-            'books': {
-                'count': books.height,
-                'unique_isbns': books['ISBN'].n_unique(),
-                'missing_titles': books['Book-Title'].null_count()
-            },
+            'books': book_stats.row(0, named=True),
             'ratings': {
-                'count': ratings.height,
-                'unique_users': ratings['User-ID'].n_unique(),
-                'unique_books': ratings['ISBN'].n_unique(),
-                'rating_range': (ratings['Book-Rating'].min(), ratings['Book-Rating'].max())
+                'count': rating_row['count'],
+                'unique_users': rating_row['unique_users'],
+                'unique_books': rating_row['unique_books'],
+                'rating_range': (rating_row['min_rating'], rating_row['max_rating'])
             },
-            'users': {
-                'count': users.height,
-                'unique_users': users['User-ID'].n_unique()
-            }
+            'users': user_stats.row(0, named=True)
         }
         
-        return stats
\ No newline at end of file
+        return stats
@@ -1,8 +1,15 @@
 """Data processing utilities for book recommendation dataset."""
 
+import numpy as np
 import polars as pl
 import re
-from typing import Tuple, Dict, Any
+from scipy.sparse import coo_matrix  # type: ignore[import-untyped]
+from typing import Tuple, Dict, Any, TypeVar, Union
+
+# Cleaning steps are plain expressions, so they work eagerly or lazily
+Frame = Union[pl.DataFrame, pl.LazyFrame]
+# ...and return the same kind of frame they were given
+FrameT = TypeVar("FrameT", pl.DataFrame, pl.LazyFrame)
 
 
 class BookDataProcessor:
@@ -12,7 +19,7 @@ class BookDataProcessor:
         self.min_ratings_per_user = min_ratings_per_user
         self.min_ratings_per_book = min_ratings_per_book
     
-    def clean_books(self, books: pl.DataFrame) -> pl.DataFrame:
+    def clean_books(self, books: FrameT) -> FrameT:
         """Clean books dataset."""
         return books.with_columns([
             # Clean year column - extract 4-digit years, convert invalid to null
@@ -34,7 +41,7 @@ class BookDataProcessor:
             pl.col("Publisher").str.strip_chars().alias("publisher")
         ]).select(["isbn", "title", "author", "year", "publisher"])
     
-    def clean_ratings(self, ratings: pl.DataFrame) -> pl.DataFrame:
+    def clean_ratings(self, ratings: FrameT) -> FrameT:
         """Standardize columns of ratings dataset."""
         return ratings.with_columns([
             pl.col("User-ID").alias("user_id"),
@@ -42,7 +49,7 @@ class BookDataProcessor:
             pl.col("Book-Rating").alias("rating")
         ]).select(["user_id", "isbn", "rating"])
     
-    def clean_users(self, users: pl.DataFrame) -> pl.DataFrame:
+    def clean_users(self, users: FrameT) -> FrameT:
         """Clean users dataset."""
         return users.with_columns([
             pl.col("User-ID").alias("user_id"),
@@ -52,28 +59,18 @@ class BookDataProcessor:
     
     def filter_sparse_data(self, ratings: pl.DataFrame) -> pl.DataFrame:
         """Remove records (could be users or books) with too few ratings."""
-        # Count ratings per user and book
-        user_counts = ratings.group_by("user_id").len().rename({"len": "user_rating_count"})
-        book_counts = ratings.group_by("isbn").len().rename({"len": "book_rating_count"})
-        
-        # Filter iteratively
-        prev_shape = (0, 0)
-        while ratings.shape != prev_shape:
-            prev_shape = ratings.shape
-            
-            # Filter users with enough ratings
-            ratings = ratings.join(user_counts, on="user_id").filter(
-                pl.col("user_rating_count") >= self.min_ratings_per_user
-            ).drop("user_rating_count")
-            
-            # Filter books with enough ratings
-            ratings = ratings.join(book_counts, on="isbn").filter(
-                pl.col("book_rating_count") >= self.min_ratings_per_book
-            ).drop("book_rating_count")
-            
-            # Recalculate counts
-            user_counts = ratings.group_by("user_id").len().rename({"len": "user_rating_count"})
-            book_counts = ratings.group_by("isbn").len().rename({"len": "book_rating_count"})
+        # Both counts are window expressions over the same frame, so each
+        # pass is one plan instead of two group-bys plus two joins
+        enough_ratings = (
+            (pl.len().over("user_id") >= self.min_ratings_per_user)
+            & (pl.len().over("isbn") >= self.min_ratings_per_book)
+        )
+        
+        # Filter iteratively until no more rows are removed
+        prev_height = -1
+        while ratings.height != prev_height:
+            prev_height = ratings.height
+            ratings = ratings.lazy().filter(enough_ratings).collect()
         
         return ratings
     
@@ -83,29 +80,58 @@ class BookDataProcessor:
         unique_users = ratings["user_id"].unique().sort()
         unique_books = ratings["isbn"].unique().sort()
         
-        user_to_idx = {user: idx for idx, user in enumerate(unique_users.to_list())}
-        book_to_idx = {book: idx for idx, book in enumerate(unique_books.to_list())}
+        # Lookup tables: position in the sorted unique values is the index
+        user_map = unique_users.to_frame().with_row_index("user_idx").with_columns(
+            pl.col("user_idx").cast(pl.Int32)
+        )
+        book_map = unique_books.to_frame().with_row_index("book_idx").with_columns(
+            pl.col("book_idx").cast(pl.Int32)
+        )
         
-        # Add mapped indices
-        interaction_matrix = ratings.with_columns([
-            pl.col("user_id").map_elements(lambda x: user_to_idx[x], return_dtype=pl.Int32).alias("user_idx"),
-            pl.col("isbn").map_elements(lambda x: book_to_idx[x], return_dtype=pl.Int32).alias("book_idx")
-        ])
+        # Add mapped indices via hash joins (no per-row Python calls)
+        interaction_matrix = ratings.join(
+            user_map, on="user_id", how="left", maintain_order="left"
+        ).join(
+            book_map, on="isbn", how="left", maintain_order="left"
+        )
+        
+        # Sparse user x book rating matrix for downstream models, built from
+        # the index columns directly rather than re-derived by each consumer
+        csr_matrix = coo_matrix(
+            (
+                interaction_matrix["rating"].to_numpy().astype(np.float32),
+                (
+                    interaction_matrix["user_idx"].to_numpy(),
+                    interaction_matrix["book_idx"].to_numpy(),
+                ),
+            ),
+            shape=(len(unique_users), len(unique_books)),
+        ).tocsr()
         
+        # Forward lookups stay as the join tables; reverse lookups are the
+        # sorted ids themselves, so idx_to_user[idx] is plain array indexing
         mappings = {
-            "user_to_idx": user_to_idx,
-            "book_to_idx": book_to_idx,
-            "idx_to_user": {v: k for k, v in user_to_idx.items()},
-            "idx_to_book": {v: k for k, v in book_to_idx.items()},
+            "user_to_idx": user_map,
+            "book_to_idx": book_map,
+            "idx_to_user": unique_users.to_numpy(),
+            "idx_to_book": unique_books.to_numpy(),
             "n_users": len(unique_users),
-            "n_books": len(unique_books)
+            "n_books": len(unique_books),
+            "csr_matrix": csr_matrix
         }
         
         return interaction_matrix, mappings
     
-    def create_llm_context_features(self, books: pl.DataFrame, users: pl.DataFrame, 
-                                   ratings: pl.DataFrame) -> pl.DataFrame:
-        """Create features for LLM context generation."""
+    def create_llm_context_features(self, books: Frame, users: Frame, 
+                                   ratings: Frame) -> Tuple[pl.DataFrame, pl.DataFrame]:
+        """
+        Create features for LLM context generation.
+        
+        Both outputs are built as one lazy plan and collected together, so
+        the shared ratings input is scanned once for both aggregations.
+        """
+        books, users, ratings = books.lazy(), users.lazy(), ratings.lazy()
+        
         # User reading profile
         user_profiles = ratings.group_by("user_id").agg([
             pl.col("rating").mean().alias("avg_rating"),
@@ -120,30 +146,39 @@ class BookDataProcessor:
         ])
         
         # Combine with metadata
-        enhanced_books = books.join(book_stats, on="isbn")
-        enhanced_users = users.join(user_profiles, on="user_id")
+        books_plan = books.join(book_stats, on="isbn")
+        users_plan = users.join(user_profiles, on="user_id")
         
+        enhanced_books, enhanced_users = pl.collect_all(
+            [books_plan, users_plan], engine="streaming"
+        )
         return enhanced_books, enhanced_users
     
-    def process_all(self, books: pl.DataFrame, ratings: pl.DataFrame, 
-                   users: pl.DataFrame) -> Tuple[pl.DataFrame, pl.DataFrame, pl.DataFrame, Dict[str, Any]]:
-        """Process all datasets."""
-        # Clean datasets
-        clean_books = self.clean_books(books)
-        clean_ratings = self.clean_ratings(ratings)
-        clean_users = self.clean_users(users)
+    def process_all(self, books: Frame, ratings: Frame, 
+                   users: Frame) -> Tuple[pl.DataFrame, pl.DataFrame, pl.DataFrame, Dict[str, Any]]:
+        """
+        Process all datasets.
         
-        # Filter sparse data
-        filtered_ratings = self.filter_sparse_data(clean_ratings)
+        Accepts eager or lazy frames. Cleaning stays lazy so column selection
+        and filters are pushed down into the CSV scan; frames are only
+        collected (with the streaming engine) where a result is needed.
+        """
+        # Clean datasets
+        clean_books = self.clean_books(books.lazy())
+        clean_ratings = self.clean_ratings(ratings.lazy())
+        clean_users = self.clean_users(users.lazy())
         
-        # Keep only books and users that appear in filtered ratings
-        valid_books = clean_books.filter(
-            pl.col("isbn").is_in(filtered_ratings["isbn"])
-        )
-        valid_users = clean_users.filter(
-            pl.col("user_id").is_in(filtered_ratings["user_id"])
+        # Filter sparse data (iterates, so ratings are materialized once here)
+        filtered_ratings = self.filter_sparse_data(
+            clean_ratings.collect(engine="streaming")
         )
         
+        # Keep only books and users that appear in filtered ratings; these
+        # stay lazy and are collected with the context features below
+        rated = filtered_ratings.lazy()
+        valid_books = clean_books.join(rated.select("isbn"), on="isbn", how="semi")
+        valid_users = clean_users.join(rated.select("user_id"), on="user_id", how="semi")
+        
         # Create interaction matrix and mappings
         interaction_matrix, mappings = self.create_interaction_matrix(filtered_ratings)
         
@@ -0,0 +1,281 @@
+"""
+Dynamic request batching for the embedding model.
+
+Concurrent requests are queued and coalesced into a single encode call,
+so N in-flight single-text requests cost one forward pass instead of N.
+Tokenization and the forward pass each run on a dedicated worker thread,
+so neither blocks the event loop and the next batch is tokenized while
+the current one is being encoded.
+"""
+
+import asyncio
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# (texts, normalize, future, arrival time on the event loop clock)
+QueueItem = Tuple[List[str], bool, asyncio.Future, float]
+
+
+def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """Scale each row to unit L2 norm in place."""
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return np.divide(embeddings, np.maximum(norms, 1e-12), out=embeddings)
+
+
+def _fail(batch: List[QueueItem], error: Exception) -> None:
+    """Fail every still-pending request in a batch."""
+    for _, _, future, _ in batch:
+        if not future.done():
+            future.set_exception(error)
+
+
+class DynamicBatcher:
+    """
+    Coalesces concurrent encode requests into batched forward passes.
+
+    Requests are queued as (texts, future) pairs. A background task sorts
+    them into buckets by padded length (the longest text rounded up to
+    bucket_width), so each forward pass pads rows to a similar length
+    instead of to the longest text in flight. A bucket is encoded once it
+    holds max_batch_size texts, or once its oldest request has waited
+    batch_wait_timeout_s; each future gets its own slice of the embeddings.
+
+    length_fn measures a text and runs on the event loop for every queued
+    text, so it must be cheap. The default is the character count with
+    64-character buckets, roughly 16 tokens for English text; running the
+    tokenizer here would block the loop and tokenize every text twice.
+
+    With a tokenize_fn, batches flow through two stages: one tokenizes a
+    batch on its own thread and hands it over, the other runs encode_fn on
+    the tokenized inputs. The next batch is only formed once the encode
+    stage has taken the previous one, so at most one batch is tokenized
+    ahead of the forward pass and later arrivals keep coalescing.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[Any], np.ndarray],
+        max_batch_size: int = 32,
+        batch_wait_timeout_s: float = 0.01,
+        length_fn: Callable[[str], int] = len,
+        bucket_width: int = 64,
+        tokenize_fn: Optional[Callable[[List[str]], Any]] = None,
+    ):
+        self._encode_fn = encode_fn
+        self._tokenize_fn = tokenize_fn
+        self._length_fn = length_fn
+        self.max_batch_size = max_batch_size
+        self.batch_wait_timeout_s = batch_wait_timeout_s
+        self.bucket_width = bucket_width
+        # Queues bind to an event loop on first use, so start() replaces
+        # them to keep a restarted batcher off a stale loop
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+
+        # Tokenized batches handed from the tokenize stage to the encode stage
+        self._ready: asyncio.Queue = asyncio.Queue()
+        # Held from forming a batch until the encode stage takes it
+        self._slot = asyncio.Semaphore(1)
+
+        # Requests waiting to be batched, grouped by padded length and kept
+        # in arrival order within each bucket
+        self._buckets: Dict[int, List[QueueItem]] = {}
+
+        # A single thread owns the model, so forward passes never overlap
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="inference"
+        )
+        # HF fast tokenizers release the GIL, so this overlaps the forward pass
+        self._tokenizer_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tokenizer"
+        )
+
+    @property
+    def running(self) -> bool:
+        """Whether the background batching loop is active."""
+        return bool(self._tasks) and not any(task.done() for task in self._tasks)
+
+    def start(self) -> None:
+        """
+        Start the background batching loop on the running event loop.
+
+        Must be called from within the event loop, e.g. in the FastAPI lifespan.
+        """
+        if self.running:
+            return
+
+        self._queue = asyncio.Queue()
+        self._ready = asyncio.Queue()
+        self._slot = asyncio.Semaphore(1)
+        self._tasks = [
+            asyncio.create_task(self._tokenize_loop()),
+            asyncio.create_task(self._encode_loop()),
+        ]
+        logger.info(
+            f"Dynamic batcher started (max_batch_size={self.max_batch_size}, "
+            f"batch_wait_timeout_s={self.batch_wait_timeout_s})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the batching loop and fail any requests still queued."""
+        if not self._tasks:
+            return
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        leftovers = [item for bucket in self._buckets.values() for item in bucket]
+        self._buckets = {}
+        while not self._queue.empty():
+            leftovers.append(self._queue.get_nowait())
+        while not self._ready.empty():
+            leftovers.extend(self._ready.get_nowait()[0])
+        _fail(leftovers, RuntimeError("Batcher stopped"))
+
+    async def submit(self, text: str, normalize: bool = False) -> np.ndarray:
+        """Queue a single text for encoding and wait for its embedding."""
+        embeddings = await self.submit_many([text], normalize=normalize)
+        return embeddings[0]
+
+    async def submit_many(
+        self, texts: List[str], normalize: bool = False
+    ) -> np.ndarray:
+        """
+        Queue a list of texts for encoding and wait for their embeddings.
+
+        The texts are kept together in one forward pass. With normalize=True
+        the returned rows are unit-norm, so cosine similarity is a plain dot
+        product. Falls back to encoding them alone on the inference thread
+        if the batching loop is not running (e.g. when the app is used
+        without its lifespan).
+        """
+        if not self.running:
+            loop = asyncio.get_running_loop()
+            inputs = texts
+            if self._tokenize_fn is not None:
+                inputs = await loop.run_in_executor(
+                    self._tokenizer_executor, self._tokenize_fn, texts
+                )
+            embeddings = await loop.run_in_executor(
+                self._executor, self._encode_fn, inputs
+            )
+            return _normalize_rows(embeddings) if normalize else embeddings
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        await self._queue.put((texts, normalize, future, loop.time()))
+        return await future
+
+    def _add_pending(self, item: QueueItem) -> None:
+        """Place a queued request in the bucket for its padded length."""
+        length = max(self._length_fn(text) for text in item[0])
+        key = math.ceil(length / self.bucket_width) * self.bucket_width
+        self._buckets.setdefault(key, []).append(item)
+
+    def _pop_batch(self, key: int) -> List[QueueItem]:
+        """Take requests from a bucket, oldest first, up to max_batch_size texts."""
+        bucket = self._buckets[key]
+        batch = [bucket.pop(0)]
+        size = len(batch[0][0])
+        while bucket and size + len(bucket[0][0]) <= self.max_batch_size:
+            size += len(bucket[0][0])
+            batch.append(bucket.pop(0))
+
+        if not bucket:
+            del self._buckets[key]
+        return batch
+
+    async def _collect_batch(self) -> List[QueueItem]:
+        """Bucket incoming requests until one bucket is full or times out."""
+        if not self._buckets:
+            self._add_pending(await self._queue.get())
+
+        loop = asyncio.get_running_loop()
+        while True:
+            while not self._queue.empty():
+                self._add_pending(self._queue.get_nowait())
+
+            # The bucket holding the oldest request goes first once that
+            # request has waited long enough, so a steady stream filling
+            # another bucket can't starve it
+            oldest = min(self._buckets, key=lambda key: self._buckets[key][0][3])
+            remaining = (
+                self._buckets[oldest][0][3] + self.batch_wait_timeout_s - loop.time()
+            )
+            if remaining <= 0:
+                return self._pop_batch(oldest)
+
+            # Otherwise encode a bucket as soon as it is full
+            sizes = {
+                key: sum(len(item[0]) for item in bucket)
+                for key, bucket in self._buckets.items()
+            }
+            largest = max(sizes, key=lambda key: sizes[key])
+            if sizes[largest] >= self.max_batch_size:
+                return self._pop_batch(largest)
+
+            try:
+                item = await asyncio.wait_for(self._queue.get(), remaining)
+            except asyncio.TimeoutError:
+                return self._pop_batch(oldest)
+            self._add_pending(item)
+
+    async def _tokenize_loop(self) -> None:
+        """Background stage: form batches, tokenize, hand them to encode."""
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for the encode stage to take the previous batch
+            await self._slot.acquire()
+            batch = await self._collect_batch()
+            texts = [text for item_texts, *_ in batch for text in item_texts]
+
+            try:
+                inputs = texts
+                if self._tokenize_fn is not None:
+                    inputs = await loop.run_in_executor(
+                        self._tokenizer_executor, self._tokenize_fn, texts
+                    )
+                await self._ready.put((batch, inputs))
+            except asyncio.CancelledError:
+                _fail(batch, RuntimeError("Batcher stopped"))
+                raise
+            except Exception as e:
+                logger.error(f"Batch tokenize failed: {str(e)}")
+                _fail(batch, e)
+                self._slot.release()
+
+    async def _encode_loop(self) -> None:
+        """Background stage: encode tokenized batches, dispatch results."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch, inputs = await self._ready.get()
+            self._slot.release()
+
+            try:
+                embeddings = await loop.run_in_executor(
+                    self._executor, self._encode_fn, inputs
+                )
+            except asyncio.CancelledError:
+                _fail(batch, RuntimeError("Batcher stopped"))
+                raise
+            except Exception as e:
+                logger.error(f"Batch encode failed: {str(e)}")
+                _fail(batch, e)
+                continue
+
+            # Futures may already be cancelled if the client disconnected
+            offset = 0
+            for item_texts, normalize, future, _ in batch:
+                if not future.done():
+                    rows = embeddings[offset : offset + len(item_texts)]
+                    future.set_result(_normalize_rows(rows) if normalize else rows)
+                offset += len(item_texts)
@@ -6,17 +6,26 @@ pattern here ensures that only one model instance is in memory
 to avoid duplicating large model weights.
 """
 
+import math
+import threading
 import time
 import logging
-from typing import List, Dict, Any
+from pathlib import Path
+from typing import List, Dict, Any, Optional
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 
-from ..utils.config import settings
+from ..utils.config import MAX_BATCH_SIZE, settings
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Optimum graph optimization level used for the ONNX backend: O2 adds
+# transformer-specific fusions (attention, LayerNorm, bias+GELU) on top of
+# ONNX Runtime's generic ones, without the approximations of O3
+ONNX_OPTIMIZATION_LEVEL = "O2"
+
 
 class ModelManager:
     """
@@ -25,22 +34,49 @@ class ModelManager:
     This class implements lazy loading - the model is only loaded after
     the first inference request. This makes testing a bit easier, and it allows
     the API to start quickly even if model loading fails initially.
+
+    Use get_instance() to share the process-wide instance.
     """
 
+    _instance: Optional["ModelManager"] = None
+    _instance_lock = threading.Lock()
+
     def __init__(self):
         self._model = None
         self.model_name = settings.MODEL_NAME
         self.cache_dir = settings.MODEL_CACHE_DIR
+        self.backend = settings.MODEL_BACKEND
+        self.quantize = settings.QUANTIZE
+        self.compile = settings.COMPILE_MODEL
         self.model_loaded = False
         self.load_time = None
+        self._model_info: Optional[Dict[str, Any]] = None
+
+        # The tokenizer and inference threads can both trigger a lazy load
+        self._load_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "ModelManager":
+        """Return the shared instance, creating it on first use."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
 
     def load_model(self) -> None:
         """
         Load the model into memory.
 
         This is separated to allow for explicit control
-        over when model loading happens.
+        over when model loading happens. Safe to call from several threads;
+        the model is loaded once.
         """
+        with self._load_lock:
+            self._load_model()
+
+    def _load_model(self) -> None:
+        """Load the model; callers hold _load_lock."""
         if self._model is not None:
             logger.info("Model already loaded, skipping...")
             return
@@ -48,14 +84,54 @@ class ModelManager:
         model_path = self.cache_dir / self.model_name
 
         logger.info(f"Loading model from local path: {model_path}")
-        start_time = time.time()
+        start_time = time.perf_counter()
+
+        if settings.API_WORKERS > 1:
+            # Split the cores between worker processes so their intra-op
+            # thread pools don't oversubscribe the CPU
+            num_threads = math.ceil(torch.get_num_threads() / settings.API_WORKERS)
+            torch.set_num_threads(num_threads)
+            logger.info(f"Using {num_threads} torch threads per worker")
 
         try:
             # Load model with explicit cache directory
             # This ensures models are cached between container restarts; testing to see if that is the case
-            self._model = SentenceTransformer(str(model_path), device="cpu")
-
-            self.load_time = time.time() - start_time
+            if self.backend == "onnx":
+                self._model = self._load_onnx_model(model_path)
+            else:
+                self._model = SentenceTransformer(str(model_path), device="cpu")
+
+            # tokenize()/embed() call the model directly rather than through
+            # SentenceTransformer.encode, which is what normally sets this
+            self._model.eval()
+
+            if self.quantize and self.backend == "onnx":
+                logger.warning("QUANTIZE only applies to the torch backend, ignoring")
+            elif self.quantize:
+                # Dynamic int8 quantization: Linear weights are stored as int8
+                # and activations are quantized on the fly, so the CPU forward
+                # pass reads half the weight bytes and uses int8 GEMM kernels
+                self._model = torch.ao.quantization.quantize_dynamic(
+                    self._model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+                )
+                logger.info("Applied dynamic int8 quantization to Linear layers")
+
+            if self.compile and self.backend == "onnx":
+                logger.warning(
+                    "COMPILE_MODEL only applies to the torch backend, ignoring"
+                )
+            elif self.compile:
+                # Attention already runs through torch's fused SDPA kernel;
+                # compiling the transformer also fuses the surrounding
+                # elementwise ops. dynamic=True keeps one graph for all batch
+                # sizes and sequence lengths instead of recompiling per shape
+                transformer = self._model[0]
+                transformer.auto_model = torch.compile(
+                    transformer.auto_model, dynamic=True
+                )
+                logger.info("Compiled the transformer with torch.compile")
+
+            self.load_time = time.perf_counter() - start_time
             self.model_loaded = True
 
             logger.info(f"Model loaded successfully in {self.load_time:.2f} seconds")
@@ -68,6 +144,107 @@ class ModelManager:
             logger.error(f"Failed to load model: {str(e)}")
             raise RuntimeError(f"Model loading failed: {str(e)}")
 
+        if settings.WARMUP_REQUESTS > 0:
+            self.warmup(settings.WARMUP_REQUESTS)
+
+    def _load_onnx_model(self, model_path: Path) -> SentenceTransformer:
+        """
+        Load the model with the ONNX Runtime backend.
+
+        The first load exports the model to ONNX and applies graph
+        optimizations; the optimized file is cached next to the model so
+        later starts skip the export. Requires optimum[onnxruntime].
+        """
+        from sentence_transformers import export_optimized_onnx_model
+
+        file_name = f"onnx/model_{ONNX_OPTIMIZATION_LEVEL}.onnx"
+        if not (model_path / file_name).exists():
+            logger.info(f"Exporting optimized ONNX model to {model_path / file_name}")
+            exported = SentenceTransformer(
+                str(model_path), device="cpu", backend="onnx"
+            )
+            export_optimized_onnx_model(
+                exported, ONNX_OPTIMIZATION_LEVEL, str(model_path)
+            )
+
+        # ONNX Runtime defaults to ORT_ENABLE_ALL and one intra-op thread per
+        # physical core, so no custom session options are needed
+        return SentenceTransformer(
+            str(model_path),
+            device="cpu",
+            backend="onnx",
+            model_kwargs={"file_name": file_name, "provider": "CPUExecutionProvider"},
+        )
+
+    def warmup(self, num_requests: int) -> None:
+        """
+        Run dummy batches through the model before serving traffic.
+
+        The first forward passes pay one-off costs (graph compilation with
+        COMPILE_MODEL, kernel selection otherwise), so they are spread over
+        sequence lengths up to max_seq_length to cover the shapes the
+        batcher will send.
+        """
+        start_time = time.perf_counter()
+        max_length = self._model.max_seq_length
+        for i in range(1, num_requests + 1):
+            num_tokens = max(1, max_length * i // num_requests)
+            self.encode(["hello " * num_tokens] * MAX_BATCH_SIZE)
+
+        logger.info(
+            f"Warmed up with {num_requests} batches in "
+            f"{time.perf_counter() - start_time:.2f} seconds"
+        )
+
+    def tokenize(self, texts: List[str]) -> Dict[str, torch.Tensor]:
+        """
+        Tokenize a list of texts into padded model inputs.
+
+        Split from embed() so the dynamic batcher can tokenize the next
+        batch on its own thread while the current one runs forward.
+
+        Args:
+            texts: List of input texts
+
+        Returns:
+            Dictionary of input tensors, as produced by the model's tokenizer
+        """
+        if not self.model_loaded:
+            self.load_model()
+
+        return self._model.tokenize(texts)
+
+    def embed(self, features: Dict[str, torch.Tensor]) -> np.ndarray:
+        """
+        Run the forward pass on tokenized inputs.
+
+        Args:
+            features: Output of tokenize()
+
+        Returns:
+            Array of shape (batch_size, embedding_dim)
+        """
+        if not self.model_loaded:
+            self.load_model()
+
+        with torch.no_grad():
+            output = self._model(features)
+
+        # The stacked tensor's .numpy() is a free view, no per-row copies
+        return output["sentence_embedding"].numpy()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode a list of texts in a single forward pass.
+
+        Args:
+            texts: List of input texts
+
+        Returns:
+            Array of shape (len(texts), embedding_dim)
+        """
+        return self.embed(self.tokenize(texts))
+
     def predict_single(self, text: str) -> Dict[str, Any]:
         """
         Generate embedding for a single text input.
@@ -81,20 +258,19 @@ class ModelManager:
         if not self.model_loaded:
             self.load_model()
 
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
 
-        # Generate embedding
-        # Convert to list for JSON serialization
-        embedding = self._model.encode(text, convert_to_numpy=True)
-        embedding_list = embedding.tolist()
+        # Generate embedding through the same path as batches: a float32
+        # ndarray row, serialized directly by orjson at the API layer
+        embedding = self.encode([text])[0]
 
-        inference_time = time.time() - start_time
+        inference_time_ms = (time.perf_counter_ns() - start_time) / 1e6
 
         return {
-            "embedding": embedding_list,
-            "dimension": len(embedding_list),
+            "embedding": embedding,
+            "dimension": len(embedding),
             "model_version": self.model_name,
-            "inference_time_ms": round(inference_time * 1000, 2),
+            "inference_time_ms": round(inference_time_ms, 2),
         }
 
     def predict_batch(self, texts: List[str]) -> Dict[str, Any]:
@@ -114,25 +290,24 @@ class ModelManager:
             self.load_model()
 
         # Validate batch size
-        if len(texts) > settings.MAX_BATCH_SIZE:
+        if len(texts) > MAX_BATCH_SIZE:
             raise ValueError(
-                f"Batch size {len(texts)} exceeds maximum {settings.MAX_BATCH_SIZE}"
+                f"Batch size {len(texts)} exceeds maximum {MAX_BATCH_SIZE}"
             )
 
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
 
-        embeddings = self._model.encode(texts, convert_to_numpy=True)
-        embeddings_list = embeddings.tolist()
+        embeddings = self.encode(texts)
 
-        inference_time = time.time() - start_time
+        inference_time_ms = (time.perf_counter_ns() - start_time) / 1e6
 
         return {
-            "embeddings": embeddings_list,
+            "embeddings": embeddings,
             "batch_size": len(texts),
             "dimension": embeddings.shape[1],
             "model_version": self.model_name,
-            "inference_time_ms": round(inference_time * 1000, 2),
-            "avg_time_per_item_ms": round((inference_time * 1000) / len(texts), 2),
+            "inference_time_ms": round(inference_time_ms, 2),
+            "avg_time_per_item_ms": round(inference_time_ms / len(texts), 2),
         }
 
     def compute_similarity(self, text1: str, text2: str) -> Dict[str, Any]:
@@ -149,38 +324,47 @@ class ModelManager:
         if not self.model_loaded:
             self.load_model()
 
-        start_time = time.time()
-
-        # Get embeddings for both texts
-        embeddings = self._model.encode([text1, text2], convert_to_numpy=True)
+        start_time = time.perf_counter_ns()
 
-        # Compute cosine similarity
-        similarity = np.dot(embeddings[0], embeddings[1]) / (
-            np.linalg.norm(embeddings[0]) * np.linalg.norm(embeddings[1])
+        # Encode both texts in one pass, then scale them to unit norm
+        embeddings = self.encode([text1, text2])
+        embeddings /= np.maximum(
+            np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12
         )
 
-        inference_time = time.time() - start_time
+        # Cosine similarity of unit vectors is a single dot product
+        similarity = float(embeddings[0] @ embeddings[1])
+
+        inference_time_ms = (time.perf_counter_ns() - start_time) / 1e6
 
         return {
-            "similarity": float(similarity),
+            "similarity": similarity,
             "model_version": self.model_name,
-            "inference_time_ms": round(inference_time * 1000, 2),
+            "inference_time_ms": round(inference_time_ms, 2),
         }
 
     def get_model_info(self) -> Dict[str, Any]:
         """
         Get information about the loaded model.
+
+        None of it changes once the model is loaded, so it is built on the
+        first call after loading and a copy of it is returned from then on.
         """
         if not self.model_loaded:
             return {"loaded": False, "model_name": self.model_name}
 
-        return {
-            "loaded": True,
-            "model_name": self.model_name,
-            "embedding_dimension": self._model.get_sentence_embedding_dimension(),
-            "load_time_seconds": round(self.load_time, 2) if self.load_time else None,
-            "max_sequence_length": self._model.max_seq_length,
-        }
+        if self._model_info is None:
+            self._model_info = {
+                "loaded": True,
+                "model_name": self.model_name,
+                "embedding_dimension": self._model.get_sentence_embedding_dimension(),
+                "load_time_seconds": (
+                    round(self.load_time, 2) if self.load_time else None
+                ),
+                "max_sequence_length": self._model.max_seq_length,
+            }
+
+        return dict(self._model_info)
 
 
-model_manager = ModelManager()
+model_manager = ModelManager.get_instance()
@@ -5,39 +5,156 @@ This module makes it easy to adjust settings for different environments (dev, st
 """
 
 import os
+import re
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
-from dotenv import load_dotenv
+from typing import Any, Callable, Dict, Final
 
-# Load environment variables from .env file
-load_dotenv()
+# Optional .env file at the project root
+ENV_FILE = Path(__file__).resolve().parents[2] / ".env"
 
+# Precompiled .env values, written by scripts/compile_env.py
+CACHE_FILE = Path(__file__).with_name("config_cache.py")
 
+# A comment after an unquoted value, e.g. "MAX_BATCH_SIZE=32  # limit"
+_INLINE_COMMENT = re.compile(r"\s+#.*$")
+
+# importlib.reload re-runs this module in the same namespace, so the flag
+# carries over and the .env file is parsed at most once per process
+_DOTENV_LOADED: bool = globals().get("_DOTENV_LOADED", False)
+
+
+def parse_env_file(path: Path) -> Dict[str, str]:
+    """
+    Parse KEY=VALUE lines from a .env file.
+
+    Blank lines and # comments are skipped, an optional "export " prefix
+    is allowed, and matching single or double quotes around a value are
+    stripped. Unquoted values end at a whitespace-preceded #, so inline
+    comments are dropped. A missing file parses as empty.
+    """
+    values = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#") or "=" not in line:
+                    continue
+                key, _, value = line.removeprefix("export ").partition("=")
+                value = value.strip()
+                quote = value[:1]
+                if quote in ('"', "'") and quote in value[1:]:
+                    value = value[1 : value.index(quote, 1)]
+                else:
+                    value = _INLINE_COMMENT.sub("", value)
+                values[key.strip()] = value
+    except FileNotFoundError:
+        pass
+    return values
+
+
+def _load_env_values() -> Dict[str, str]:
+    """
+    Read the .env values, from the precompiled cache when it is current.
+
+    The cache is only used alongside a .env it is at least as new as, so
+    editing or deleting .env after compiling is never silently ignored,
+    and a cache copied somewhere without a .env (e.g. into an image) is
+    never applied.
+    """
+    if not ENV_FILE.exists():
+        return {}
+    if CACHE_FILE.exists() and CACHE_FILE.stat().st_mtime >= ENV_FILE.stat().st_mtime:
+        from .config_cache import DOTENV  # type: ignore[import-not-found]
+
+        return DOTENV
+    return parse_env_file(ENV_FILE)
+
+
+def _ensure_dotenv() -> None:
+    """Load environment variables from the .env file, once."""
+    global _DOTENV_LOADED
+    if _DOTENV_LOADED:
+        return
+
+    # In production the platform injects the environment; skip the file
+    if os.environ.get("APP_ENV") == "production":
+        _DOTENV_LOADED = True
+        return
+
+    # Real environment variables take precedence over the file
+    for key, value in _load_env_values().items():
+        os.environ.setdefault(key, value)
+    _DOTENV_LOADED = True
+
+
+_ensure_dotenv()
+
+# Snapshot the environment once; every setting is resolved from this dict
+_env = dict(os.environ)
+
+
+def _parse_bool(value: str) -> bool:
+    """Parse a "true"/"false" environment flag."""
+    return value.lower() == "true"
+
+
+def _env_field(name: str, default: str, parse: Callable[[str], Any] = str) -> Any:
+    """A settings field resolved from the environment snapshot on init."""
+    return field(default_factory=lambda: parse(_env.get(name, default)))
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
     """Application settings loaded from environment variables."""
 
     # API Configuration
-    APP_NAME: str = os.getenv("APP_NAME", "ML Inference Platform")
-    APP_VERSION: str = os.getenv("APP_VERSION", "1.0.0")
-    API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
-    API_PORT: int = int(os.getenv("API_PORT", "8000"))
+    APP_NAME: str = _env_field("APP_NAME", "ML Inference Platform")
+    APP_VERSION: str = _env_field("APP_VERSION", "1.0.0")
+    APP_ENV: str = _env_field("APP_ENV", "development")
+    API_HOST: str = _env_field("API_HOST", "0.0.0.0")
+    API_PORT: int = _env_field("API_PORT", "8000", int)
+    API_WORKERS: int = _env_field("API_WORKERS", "1", int)
 
     # Model Configuration
-    MODEL_NAME: str = os.getenv("MODEL_NAME", "all-MiniLM-L6-v2")
-    MODEL_CACHE_DIR: str = Path(os.getenv("MODEL_CACHE_DIR", "/app/models"))
+    MODEL_NAME: str = _env_field("MODEL_NAME", "all-MiniLM-L6-v2")
+    MODEL_CACHE_DIR: Path = _env_field("MODEL_CACHE_DIR", "/app/models", Path)
+    MODEL_BACKEND: str = _env_field("MODEL_BACKEND", "torch")
+    QUANTIZE: bool = _env_field("QUANTIZE", "false", _parse_bool)
+    COMPILE_MODEL: bool = _env_field("COMPILE_MODEL", "false", _parse_bool)
+    WARMUP_REQUESTS: int = _env_field("WARMUP_REQUESTS", "0", int)
 
     # Performance Settings
-    MAX_BATCH_SIZE: int = int(os.getenv("MAX_BATCH_SIZE", "32"))
-    REQUEST_TIMEOUT: int = int(os.getenv("REQUEST_TIMEOUT", "30"))
+    MAX_BATCH_SIZE: int = _env_field("MAX_BATCH_SIZE", "32", int)
+    REQUEST_TIMEOUT: int = _env_field("REQUEST_TIMEOUT", "30", int)
+    BATCH_WAIT_TIMEOUT_MS: float = _env_field("BATCH_WAIT_TIMEOUT_MS", "10", float)
 
     # Logging
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVEL: str = _env_field("LOG_LEVEL", "INFO")
 
     @classmethod
-    def get_model_path(cls) -> Path:
+    def reload(cls) -> None:
+        """
+        Re-read the environment into the shared settings instance.
+
+        Settings are resolved once at import; tests that change environment
+        variables call this so every module holding `settings` sees them.
+        The dataclass __init__ assigns fields with object.__setattr__, so
+        it can re-initialize the frozen instance.
+        """
+        global _env
+        _env = dict(os.environ)
+        cls.__init__(settings)
+
+    def get_model_path(self) -> Path:
         """Get the full path where models are cached."""
-        return Path(cls.MODEL_CACHE_DIR) / cls.MODEL_NAME.replace("/", "_")
+        return self.MODEL_CACHE_DIR / self.MODEL_NAME.replace("/", "_")
 
 
 # Create a single instance to import throughout the application
 settings = Settings()
+
+# The batch limit is read on every request, so it is also exported as a
+# plain constant. It is fixed at import; Settings.reload() only updates
+# `settings`
+MAX_BATCH_SIZE: Final[int] = settings.MAX_BATCH_SIZE
@@ -0,0 +1,46 @@
+"""
+Shared pytest fixtures.
+"""
+
+import logging
+
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from src.api.main import app
+
+# Third-party loggers whose INFO output only adds noise to test runs
+QUIET_LOGGERS = [
+    "httpx",
+    "multipart.multipart",
+    "sentence_transformers",
+    "transformers",
+    "urllib3",
+]
+
+
+def pytest_configure(config):
+    """
+    Silence chatty third-party loggers for the whole run.
+
+    Raising the level (rather than setting `disabled`) also covers child
+    loggers such as sentence_transformers.SentenceTransformer, since they
+    inherit the effective level.
+    """
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    """
+    Async test client shared by the whole session.
+
+    Requests are dispatched straight to the ASGI app on the test event
+    loop. ASGITransport doesn't send lifespan events, so the lifespan is
+    entered here: the model is loaded and the batcher started once.
+    """
+    async with app.router.lifespan_context(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
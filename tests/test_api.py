@@ -3,28 +3,23 @@ Tests for the FastAPI application endpoints.
 """
 
 import pytest
-from fastapi.testclient import TestClient
-from src.api.main import app
-from src.utils.config import settings
-
-# Create test client
-client = TestClient(app)
+from src.utils.config import MAX_BATCH_SIZE
 
 
 class TestHealthEndpoints:
     """Test health check endpoints."""
 
-    def test_liveness_probe(self):
+    async def test_liveness_probe(self, client):
         """Liveness should always return 200."""
-        response = client.get("/health/live")
+        response = await client.get("/health/live")
         assert response.status_code == 200
         data = response.json()
         assert "status" in data
         assert "model_loaded" in data
 
-    def test_readiness_probe(self):
+    async def test_readiness_probe(self, client):
         """Readiness depends on model being loaded."""
-        response = client.get("/health/ready")
+        response = await client.get("/health/ready")
         # This might be 200 or 503 depending on model load status
         assert response.status_code in [200, 503]
 
@@ -37,9 +32,11 @@ class TestHealthEndpoints:
 class TestPredictionEndpoints:
     """Test main prediction endpoints."""
 
-    def test_single_prediction(self):
+    async def test_single_prediction(self, client):
         """Test single text embedding generation."""
-        response = client.post("/predict", json={"text": "This is a test sentence"})
+        response = await client.post(
+            "/predict", json={"text": "This is a test sentence"}
+        )
 
         if response.status_code == 200:
             data = response.json()
@@ -50,16 +47,11 @@ class TestPredictionEndpoints:
             assert isinstance(data["embedding"], list)
             assert len(data["embedding"]) == data["dimension"]
 
-    def test_empty_text_validation(self):
-        """Test that empty text is rejected."""
-        response = client.post("/predict", json={"text": "   "})  # Just whitespace
-        assert response.status_code == 422  # Validation error
-
-    def test_batch_prediction(self):
+    async def test_batch_prediction(self, client):
         """Test batch embedding generation."""
         texts = ["First test sentence", "Second test sentence", "Third test sentence"]
 
-        response = client.post("/predict/batch", json={"texts": texts})
+        response = await client.post("/predict/batch", json={"texts": texts})
 
         if response.status_code == 200:
             data = response.json()
@@ -68,18 +60,18 @@ class TestPredictionEndpoints:
             assert data["batch_size"] == len(texts)
             assert len(data["embeddings"]) == len(texts)
 
-    def test_batch_size_limit(self):
+    async def test_batch_size_limit(self, client):
         """Test that batch size limit is enforced."""
         # Create a batch larger than MAX_BATCH_SIZE
-        texts = [f"Text {i}" for i in range(settings.MAX_BATCH_SIZE + 1)]
+        texts = [f"Text {i}" for i in range(MAX_BATCH_SIZE + 1)]
 
-        response = client.post("/predict/batch", json={"texts": texts})
+        response = await client.post("/predict/batch", json={"texts": texts})
 
         assert response.status_code in [400, 422]
 
-    def test_similarity_endpoint(self):
+    async def test_similarity_endpoint(self, client):
         """Test similarity computation."""
-        response = client.post(
+        response = await client.post(
             "/similarity",
             json={"text1": "The cat is on the mat", "text2": "A feline sits on a rug"},
         )
@@ -95,9 +87,9 @@ class TestPredictionEndpoints:
 class TestModelEndpoints:
     """Test model information endpoints."""
 
-    def test_model_info(self):
+    async def test_model_info(self, client):
         """Test model information endpoint."""
-        response = client.get("/model/info")
+        response = await client.get("/model/info")
         assert response.status_code == 200
 
         data = response.json()
@@ -112,9 +104,9 @@ class TestModelEndpoints:
 class TestGeneralEndpoints:
     """Test general API endpoints."""
 
-    def test_root_endpoint(self):
+    async def test_root_endpoint(self, client):
         """Test root endpoint returns service info."""
-        response = client.get("/")
+        response = await client.get("/")
         assert response.status_code == 200
 
         data = response.json()
@@ -123,43 +115,43 @@ class TestGeneralEndpoints:
         assert "status" in data
         assert data["status"] == "running"
 
-    def test_openapi_documentation(self):
+    async def test_openapi_documentation(self, client):
         """Test that OpenAPI documentation is available."""
-        response = client.get("/docs")
+        response = await client.get("/docs")
         assert response.status_code == 200
 
         # Test OpenAPI JSON endpoint
-        response = client.get("/openapi.json")
+        response = await client.get("/openapi.json")
         assert response.status_code == 200
 
         data = response.json()
         assert "openapi" in data
         assert "paths" in data
         assert "components" in data
+        assert "servers" in data
 
 
 class TestErrorHandling:
     """Test error handling and edge cases."""
 
-    def test_invalid_json(self):
-        """Test handling of invalid JSON."""
-        response = client.post(
-            "/predict",
-            data="not valid json",
-            headers={"Content-Type": "application/json"},
-        )
-        assert response.status_code == 422
-
-    def test_missing_required_field(self):
-        """Test handling of missing required fields."""
-        response = client.post("/predict", json={})  # Missing 'text' field
-        assert response.status_code == 422
-
-    def test_text_too_long(self):
-        """Test handling of text exceeding max length."""
-        long_text = "a" * 1000  # Exceeds 512 char limit
-
-        response = client.post("/predict", json={"text": long_text})
+    @pytest.mark.parametrize(
+        "request_kwargs",
+        [
+            pytest.param({"json": {"text": "   "}}, id="whitespace-only"),
+            pytest.param({"json": {"text": "a" * 1000}}, id="exceeds-512-chars"),
+            pytest.param({"json": {}}, id="missing-text-field"),
+            pytest.param(
+                {
+                    "content": "not valid json",
+                    "headers": {"Content-Type": "application/json"},
+                },
+                id="invalid-json",
+            ),
+        ],
+    )
+    async def test_invalid_predict_input(self, client, request_kwargs):
+        """Malformed /predict requests should be rejected as validation errors."""
+        response = await client.post("/predict", **request_kwargs)
         assert response.status_code == 422
 
 
@@ -0,0 +1,257 @@
+"""
+Tests for the dynamic request batcher.
+
+These use a fake encode function so they run without loading a model.
+"""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+import pytest_asyncio
+
+from src.models.batcher import DynamicBatcher
+
+
+class FakeEncoder:
+    """Records each call and returns one row per text."""
+
+    def __init__(self, dimension: int = 4):
+        self.dimension = dimension
+        self.calls = []
+        self.threads = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        self.threads.append(threading.current_thread())
+        return np.array(
+            [[float(len(text))] * self.dimension for text in texts],
+            dtype=np.float32,
+        )
+
+
+@pytest_asyncio.fixture
+async def make_batcher():
+    """Build started batchers and stop them on teardown, even if a test fails."""
+    batchers = []
+
+    def factory(encode_fn, **kwargs):
+        batcher = DynamicBatcher(encode_fn, **kwargs)
+        batcher.start()
+        batchers.append(batcher)
+        return batcher
+
+    yield factory
+    for batcher in batchers:
+        await batcher.stop()
+
+
+class TestDynamicBatcher:
+    """Test the DynamicBatcher class."""
+
+    async def test_concurrent_requests_are_coalesced(self, make_batcher):
+        """Concurrent submissions should share a single encode call."""
+        encoder = FakeEncoder()
+        batcher = make_batcher(encoder, max_batch_size=8, batch_wait_timeout_s=0.05)
+
+        texts = ["a", "bb", "ccc", "dddd"]
+        results = await asyncio.gather(*(batcher.submit(text) for text in texts))
+
+        assert len(encoder.calls) == 1
+        assert encoder.calls[0] == texts
+        for text, embedding in zip(texts, results):
+            assert embedding[0] == len(text)
+
+    async def test_max_batch_size_is_respected(self, make_batcher):
+        """No encode call should receive more than max_batch_size texts."""
+        encoder = FakeEncoder()
+        batcher = make_batcher(encoder, max_batch_size=3, batch_wait_timeout_s=0.05)
+
+        await asyncio.gather(*(batcher.submit(f"text {i}") for i in range(7)))
+
+        assert all(len(call) <= 3 for call in encoder.calls)
+        assert sum(len(call) for call in encoder.calls) == 7
+
+    async def test_submit_many_keeps_texts_together(self, make_batcher):
+        """A multi-text request gets back its own rows, in order."""
+        encoder = FakeEncoder()
+        batcher = make_batcher(encoder, max_batch_size=4, batch_wait_timeout_s=0.05)
+
+        single, many = await asyncio.gather(
+            batcher.submit("x"), batcher.submit_many(["yy", "zzz", "wwww"])
+        )
+        overflow = await batcher.submit_many(["a", "b", "c", "d"])
+
+        assert single[0] == 1
+        assert [row[0] for row in many] == [2, 3, 4]
+        assert overflow.shape == (4, encoder.dimension)
+        assert all(len(call) <= 4 for call in encoder.calls)
+
+    async def test_requests_are_grouped_by_length(self, make_batcher):
+        """Short and long texts should be encoded in separate batches."""
+        encoder = FakeEncoder()
+        batcher = make_batcher(encoder, max_batch_size=8, batch_wait_timeout_s=0.05)
+
+        texts = ["a", "x" * 100, "bb", "y" * 110, "ccc"]
+        results = await asyncio.gather(*(batcher.submit(text) for text in texts))
+
+        assert sorted(encoder.calls) == [["a", "bb", "ccc"], ["x" * 100, "y" * 110]]
+        for text, embedding in zip(texts, results):
+            assert embedding[0] == len(text)
+
+    async def test_full_bucket_is_encoded_first(self, make_batcher):
+        """A full bucket goes first; a lone long text still goes after it."""
+        encoder = FakeEncoder()
+        batcher = make_batcher(encoder, max_batch_size=3, batch_wait_timeout_s=0.05)
+
+        long_text = "z" * 100
+        await asyncio.gather(
+            batcher.submit(long_text), *(batcher.submit(t) for t in ["a", "b", "c"])
+        )
+
+        assert encoder.calls == [["a", "b", "c"], [long_text]]
+
+    async def test_long_text_is_not_starved_by_steady_short_traffic(self, make_batcher):
+        """A lone long text should be served while other buckets keep filling."""
+        encoder = FakeEncoder()
+
+        def slow_encoder(texts):
+            time.sleep(0.02)
+            return encoder(texts)
+
+        batcher = make_batcher(
+            slow_encoder, max_batch_size=4, batch_wait_timeout_s=0.01
+        )
+
+        async def short_traffic():
+            while True:
+                for _ in range(4):
+                    asyncio.ensure_future(batcher.submit("short"))
+                await asyncio.sleep(0.01)
+
+        traffic = asyncio.create_task(short_traffic())
+        await asyncio.sleep(0.05)
+        try:
+            embedding = await asyncio.wait_for(batcher.submit("z" * 300), timeout=1)
+        finally:
+            traffic.cancel()
+
+        assert embedding[0] == 300
+
+    async def test_normalized_rows_are_unit_norm(self, make_batcher):
+        """normalize=True should only scale the requesting rows."""
+        encoder = FakeEncoder()
+        batcher = make_batcher(encoder, batch_wait_timeout_s=0.05)
+
+        raw, normalized = await asyncio.gather(
+            batcher.submit("abc"), batcher.submit_many(["ab", "abcd"], normalize=True)
+        )
+
+        assert len(encoder.calls) == 1
+        assert raw[0] == 3
+        np.testing.assert_allclose(np.linalg.norm(normalized, axis=1), 1.0, rtol=1e-6)
+
+    async def test_encode_runs_off_the_event_loop(self, make_batcher):
+        """The forward pass should run on the dedicated inference thread."""
+        encoder = FakeEncoder()
+        batcher = make_batcher(encoder, batch_wait_timeout_s=0.01)
+
+        await batcher.submit("text")
+
+        assert encoder.threads[0] is not threading.current_thread()
+        assert encoder.threads[0].name.startswith("inference")
+
+    async def test_tokenize_fn_output_is_encoded(self, make_batcher):
+        """With a tokenize_fn, encode_fn receives its output for the batch."""
+        encoder = FakeEncoder()
+        tokenizer_threads = []
+
+        def tokenize(texts):
+            tokenizer_threads.append(threading.current_thread())
+            return [text.upper() for text in texts]
+
+        batcher = make_batcher(encoder, batch_wait_timeout_s=0.05, tokenize_fn=tokenize)
+
+        await asyncio.gather(batcher.submit("ab"), batcher.submit("cd"))
+
+        assert encoder.calls == [["AB", "CD"]]
+        assert tokenizer_threads[0].name.startswith("tokenizer")
+
+    async def test_next_batch_is_tokenized_during_encode(self, make_batcher):
+        """The second batch should be tokenized while the first encodes."""
+        second_tokenized = threading.Event()
+        overlapped = []
+        tokenize_calls = []
+
+        def tokenize(texts):
+            tokenize_calls.append(texts)
+            if len(tokenize_calls) == 2:
+                second_tokenized.set()
+            return texts
+
+        def encoder(texts):
+            if not overlapped:
+                overlapped.append(second_tokenized.wait(timeout=2))
+            return np.ones((len(texts), 4), dtype=np.float32)
+
+        batcher = make_batcher(
+            encoder, max_batch_size=2, batch_wait_timeout_s=0.01, tokenize_fn=tokenize
+        )
+
+        await asyncio.gather(*(batcher.submit(f"text {i}") for i in range(4)))
+
+        assert overlapped == [True]
+
+    async def test_tokenizer_stays_one_batch_ahead(self, make_batcher):
+        """Only the next batch should be formed while one is encoding."""
+        release = threading.Event()
+        tokenize_calls = []
+
+        def tokenize(texts):
+            tokenize_calls.append(texts)
+            return texts
+
+        def encoder(texts):
+            release.wait(timeout=2)
+            return np.ones((len(texts), 4), dtype=np.float32)
+
+        batcher = make_batcher(
+            encoder, max_batch_size=2, batch_wait_timeout_s=0.01, tokenize_fn=tokenize
+        )
+
+        requests = asyncio.gather(*(batcher.submit(f"text {i}") for i in range(6)))
+        await asyncio.sleep(0.1)
+        try:
+            assert len(tokenize_calls) == 2
+        finally:
+            release.set()
+        await requests
+
+        assert len(tokenize_calls) == 3
+
+    async def test_encode_errors_propagate(self, make_batcher):
+        """A failing encode should fail every request in the batch."""
+
+        def failing_encoder(texts):
+            raise RuntimeError("boom")
+
+        batcher = make_batcher(failing_encoder, batch_wait_timeout_s=0.01)
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await batcher.submit("text")
+
+        # The loop should survive the failure
+        assert batcher.running
+
+    async def test_submit_without_start_encodes_directly(self):
+        """Without a running loop, submit should still return an embedding."""
+        encoder = FakeEncoder()
+        batcher = DynamicBatcher(encoder)
+
+        embedding = await batcher.submit("hello")
+
+        assert not batcher.running
+        assert encoder.calls == [["hello"]]
+        assert embedding[0] == 5
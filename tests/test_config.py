@@ -0,0 +1,79 @@
+"""
+Tests for the settings module.
+"""
+
+import os
+
+from src.utils import config
+from src.utils.config import Settings, parse_env_file, settings
+
+
+class TestSettings:
+    """Test the Settings class."""
+
+    def test_reload_picks_up_environment_changes(self, monkeypatch):
+        """reload should update the shared instance in place."""
+        original = settings.MAX_BATCH_SIZE
+
+        monkeypatch.setenv("MAX_BATCH_SIZE", str(original + 1))
+        Settings.reload()
+        assert settings.MAX_BATCH_SIZE == original + 1
+        # Module constants are fixed at import
+        assert config.MAX_BATCH_SIZE == original
+
+        monkeypatch.undo()
+        Settings.reload()
+        assert settings.MAX_BATCH_SIZE == original
+
+    def test_parse_env_file(self, tmp_path):
+        """Comments, inline comments, export prefixes and quotes should be handled."""
+        env_file = tmp_path / ".env"
+        env_file.write_text(
+            "# comment\n"
+            "\n"
+            "APP_NAME=ML Inference Platform\n"
+            "export LOG_LEVEL=DEBUG\n"
+            "MODEL_NAME = 'all-MiniLM-L6-v2'\n"
+            'APP_VERSION="1.0.0"\n'
+            "MAX_BATCH_SIZE=32  # limit\n"
+            "LOG_FORMAT='%(message)s # raw'  # quoted\n"
+            "NOT_A_SETTING\n"
+        )
+
+        assert parse_env_file(env_file) == {
+            "APP_NAME": "ML Inference Platform",
+            "LOG_LEVEL": "DEBUG",
+            "MODEL_NAME": "all-MiniLM-L6-v2",
+            "APP_VERSION": "1.0.0",
+            "MAX_BATCH_SIZE": "32",
+            "LOG_FORMAT": "%(message)s # raw",
+        }
+        assert parse_env_file(tmp_path / "missing.env") == {}
+
+    def test_production_skips_env_file(self, monkeypatch):
+        """With APP_ENV=production the .env values must not be applied."""
+        monkeypatch.setattr(config, "_DOTENV_LOADED", False)
+        monkeypatch.setattr(
+            config, "_load_env_values", lambda: {"SETTINGS_TEST_ONLY": "from-file"}
+        )
+        monkeypatch.setenv("APP_ENV", "production")
+        monkeypatch.delenv("SETTINGS_TEST_ONLY", raising=False)
+
+        config._ensure_dotenv()
+
+        assert "SETTINGS_TEST_ONLY" not in os.environ
+
+    def test_stale_cache_is_ignored(self, monkeypatch, tmp_path):
+        """A .env edited or deleted after compiling should win over the cache."""
+        env_file = tmp_path / ".env"
+        cache_file = tmp_path / "config_cache.py"
+        cache_file.write_text("DOTENV = {'MAX_BATCH_SIZE': '8'}\n")
+        env_file.write_text("MAX_BATCH_SIZE=16\n")
+        os.utime(cache_file, (0, 0))
+        monkeypatch.setattr(config, "ENV_FILE", env_file)
+        monkeypatch.setattr(config, "CACHE_FILE", cache_file)
+
+        assert config._load_env_values() == {"MAX_BATCH_SIZE": "16"}
+
+        env_file.unlink()
+        assert config._load_env_values() == {}
@@ -0,0 +1,161 @@
+"""
+Tests for the book recommendation data processing module.
+
+These use small in-memory frames and temporary CSVs, so they run
+without the raw dataset.
+"""
+
+import numpy as np
+import pytest
+import polars as pl
+from src.data.loaders import BookDataLoader
+from src.data.processors import BookDataProcessor
+
+
+class TestBookDataProcessor:
+    """Test the BookDataProcessor class."""
+
+    @pytest.fixture
+    def processor(self):
+        """Create a processor with low thresholds for small test data."""
+        return BookDataProcessor(min_ratings_per_user=2, min_ratings_per_book=2)
+
+    @pytest.fixture
+    def ratings(self):
+        """Cleaned ratings in the shape produced by clean_ratings."""
+        return pl.DataFrame(
+            {
+                "user_id": [30, 10, 20, 10, 30, 20],
+                "isbn": ["b", "a", "c", "b", "a", "a"],
+                "rating": [5, 3, 0, 8, 7, 9],
+            }
+        )
+
+    def test_interaction_matrix_indices(self, processor, ratings):
+        """Indices should follow sorted id order and keep row order."""
+        interaction_matrix, mappings = processor.create_interaction_matrix(ratings)
+
+        assert interaction_matrix["user_id"].to_list() == [30, 10, 20, 10, 30, 20]
+        assert interaction_matrix["user_idx"].to_list() == [2, 0, 1, 0, 2, 1]
+        assert interaction_matrix["book_idx"].to_list() == [1, 0, 2, 1, 0, 0]
+        assert interaction_matrix["user_idx"].dtype == pl.Int32
+        assert interaction_matrix["book_idx"].dtype == pl.Int32
+
+        assert mappings["n_users"] == 3
+        assert mappings["n_books"] == 3
+        assert mappings["user_to_idx"].rows() == [(0, 10), (1, 20), (2, 30)]
+        assert mappings["book_to_idx"].rows() == [(0, "a"), (1, "b"), (2, "c")]
+        assert mappings["idx_to_user"].tolist() == [10, 20, 30]
+        assert mappings["idx_to_book"].tolist() == ["a", "b", "c"]
+
+    def test_interaction_csr_matrix(self, processor, ratings):
+        """The CSR matrix should hold each rating at its (user, book) index."""
+        _, mappings = processor.create_interaction_matrix(ratings)
+        matrix = mappings["csr_matrix"]
+
+        assert matrix.shape == (3, 3)
+        assert matrix.dtype == np.float32
+        assert matrix.nnz == 6
+        # user 30 -> 2, book "a" -> 0
+        assert matrix[2, 0] == 7
+        assert matrix.toarray().sum() == 32
+
+    def test_llm_context_features(self, processor, ratings):
+        """Book and user stats should be joined onto their metadata."""
+        books = pl.DataFrame({"isbn": ["a", "b", "c"], "title": ["A", "B", "C"]})
+        users = pl.DataFrame({"user_id": [10, 20, 30], "age": [20, None, 40]})
+
+        enhanced_books, enhanced_users = processor.create_llm_context_features(
+            books, users, ratings.lazy()
+        )
+
+        book_a = enhanced_books.filter(pl.col("isbn") == "a")
+        assert book_a["avg_rating"].item() == pytest.approx(19 / 3)
+        assert book_a["total_ratings"].item() == 3
+        assert enhanced_users.sort("user_id")["total_ratings"].to_list() == [2, 2, 2]
+
+    def test_filter_sparse_data_reaches_fixed_point(self, processor):
+        """Removing a sparse book can make a user sparse, and vice versa."""
+        ratings = pl.DataFrame(
+            {
+                "user_id": [1, 1, 2, 2, 3, 3],
+                "isbn": ["a", "b", "a", "b", "a", "c"],
+                "rating": [1, 2, 3, 4, 5, 6],
+            }
+        )
+
+        filtered = processor.filter_sparse_data(ratings)
+
+        # Book "c" has one rating; dropping it leaves user 3 with one rating
+        assert filtered["user_id"].to_list() == [1, 1, 2, 2]
+        assert filtered["isbn"].to_list() == ["a", "b", "a", "b"]
+
+    def test_process_all_accepts_lazy_frames(self, processor, ratings):
+        """process_all should run on LazyFrames as returned by the loader."""
+        books = pl.LazyFrame(
+            {
+                "ISBN": ["a", "b", "c"],
+                "Book-Title": [" A ", "B", "C"],
+                "Book-Author": ["x", "y", "z"],
+                "Year-Of-Publication": ["1999", "n/a", "2005"],
+                "Publisher": ["p", "q", "r"],
+            }
+        )
+        users = pl.LazyFrame(
+            {
+                "User-ID": [10, 20, 30],
+                "Location": ["l1", "l2", "l3"],
+                "Age": [20, None, 40],
+            }
+        )
+        raw_ratings = ratings.rename(
+            {"user_id": "User-ID", "isbn": "ISBN", "rating": "Book-Rating"}
+        ).lazy()
+
+        enhanced_books, filtered_ratings, enhanced_users, mappings = (
+            processor.process_all(books, raw_ratings, users)
+        )
+
+        # Book "c" has a single rating; dropping it leaves user 20 with one
+        assert isinstance(enhanced_books, pl.DataFrame)
+        assert sorted(enhanced_books["isbn"].to_list()) == ["a", "b"]
+        assert enhanced_books.filter(pl.col("isbn") == "a")["title"].item() == "A"
+        assert filtered_ratings.height == 4
+        assert sorted(enhanced_users["user_id"].to_list()) == [10, 30]
+        assert mappings["n_books"] == 2
+
+
+class TestBookDataLoader:
+    """Test the BookDataLoader class."""
+
+    @pytest.fixture
+    def loader(self, tmp_path):
+        """Write tiny CSVs in the raw dataset layout."""
+        (tmp_path / "Books.csv").write_text(
+            "ISBN,Book-Title,Book-Author,Year-Of-Publication,Publisher\n"
+            "a,A,x,1999,p\n"
+            "b,,y,2000,q\n"
+        )
+        (tmp_path / "Ratings.csv").write_text(
+            "User-ID,ISBN,Book-Rating\n1,a,5\n2,a,0\n2,b,9\n"
+        )
+        (tmp_path / "Users.csv").write_text("User-ID,Location,Age\n1,l1,30\n2,l2,\n")
+        return BookDataLoader(data_dir=str(tmp_path))
+
+    def test_validate_data(self, loader):
+        """Stats should match with or without the frames cached."""
+        expected = {
+            "books": {"count": 2, "unique_isbns": 2, "missing_titles": 1},
+            "ratings": {
+                "count": 3,
+                "unique_users": 2,
+                "unique_books": 2,
+                "rating_range": (0, 9),
+            },
+            "users": {"count": 2, "unique_users": 2},
+        }
+        assert loader.validate_data() == expected
+
+        books, _, _ = loader.collect_all()
+        assert loader.collect_all()[0] is books
+        assert loader.validate_data() == expected
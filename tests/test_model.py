@@ -14,19 +14,31 @@ from src.models.sentence_transformers import ModelManager
 class TestModelManager:
     """Test the ModelManager class."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def model_manager(self):
-        """Create a fresh model manager instance for testing."""
+        """The shared model manager, so the model loads once per session."""
+        return ModelManager.get_instance()
+
+    @pytest.fixture
+    def fresh_model_manager(self):
+        """Create a fresh, unloaded model manager instance for testing."""
         return ModelManager()
 
-    def test_model_initialization(self, model_manager):
+    def test_model_initialization(self, fresh_model_manager):
         """Test that model manager initializes correctly."""
+        model_manager = fresh_model_manager
         assert model_manager._model is None
         assert model_manager.model_loaded is False
         assert model_manager.load_time is None
 
-    def test_model_loading(self, model_manager):
+    def test_get_instance_is_shared(self):
+        """get_instance should always return the same manager."""
+        assert ModelManager.get_instance() is ModelManager.get_instance()
+
+    def test_model_loading(self, fresh_model_manager):
         """Test model loading process."""
+        model_manager = fresh_model_manager
+
         # Load model
         model_manager.load_model()
 
@@ -53,9 +65,9 @@ class TestModelManager:
 
         # Check embedding properties
         embedding = result["embedding"]
-        assert isinstance(embedding, list)
+        assert isinstance(embedding, np.ndarray)
         assert len(embedding) == result["dimension"]
-        assert all(isinstance(x, float) for x in embedding)
+        assert embedding.dtype == np.float32
 
     def test_similarity_computation(self, model_manager):
         """Test similarity computation between texts."""
@@ -68,8 +80,26 @@ class TestModelManager:
         assert "inference_time_ms" in similar_result
         assert 0.25 < similar_result["similarity"] <= 1.0
 
-    def test_model_info(self, model_manager):
+    def test_quantized_model(self, model_manager):
+        """Test that int8 quantization keeps embeddings close to FP32."""
+        text = "This is a test sentence for embedding generation"
+        reference = model_manager.predict_single(text)["embedding"]
+
+        quantized_manager = ModelManager()
+        quantized_manager.quantize = True
+        quantized_manager.load_model()
+        embedding = quantized_manager.predict_single(text)["embedding"]
+
+        assert embedding.shape == reference.shape
+        similarity = np.dot(embedding, reference) / (
+            np.linalg.norm(embedding) * np.linalg.norm(reference)
+        )
+        assert similarity > 0.95
+
+    def test_model_info(self, fresh_model_manager):
         """Test model info retrieval."""
+        model_manager = fresh_model_manager
+
         # Before loading
         info = model_manager.get_model_info()
         assert info["loaded"] is False
@@ -80,3 +110,7 @@ class TestModelManager:
         assert info["loaded"] is True
         assert "embedding_dimension" in info
         assert "max_sequence_length" in info
+
+        # Cached after load, but callers get their own copy
+        info["loaded"] = False
+        assert model_manager.get_model_info() == {**info, "loaded": True}